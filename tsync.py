@@ -12,30 +12,84 @@ Updated 2025-05-05.
 
 from __future__ import annotations
 import argparse
+import functools
+import hashlib
+import json
+import os
 import random
 import re
 import shutil
 import sys
 import logging
-from datetime import datetime
+import multiprocessing
+import queue
+import tempfile
+import threading
+from concurrent.futures import (Executor, ProcessPoolExecutor, ThreadPoolExecutor,
+                                FIRST_COMPLETED, wait)
 from PIL import Image
 from pillow_heif import register_heif_opener
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List, Set, Tuple
 
 from exiftool import ExifToolHelper
 from exiftool.exceptions import ExifToolExecuteError
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_444, TJFLAG_ACCURATEDCT
+    _TURBO = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # PyTurboJPEG or libturbojpeg missing
+    _TURBO = None
+
 # ------------------------------------------------------------------------
 # configuration & constants
 # ------------------------------------------------------------------------
 DEFAULT_SRC = "/home/ntheme/Data2/Temp/Sorting"
 DEFAULT_DST = "adjusted"
 
-_VERBOSE = False
-_NO_WRITE_META = False
-
-FNAME_RE = re.compile(r"^\d{8}_\d{6}$")
+TS_RE = re.compile(r"\d{4}:\d{2}:\d{2} \d{2}:\d{2}:\d{2}")
+
+# default number of files per ExifTool read request and per argfile write run
+BATCH_SIZE = 256
+
+# bound on files waiting between pipeline stages
+QUEUE_DEPTH = 64
+
+WRITE_PARAMS = ["-overwrite_original", "-api", "QuickTimeUTC"]
+# read back tags the way they were written, plus a hash of the media data only
+COMPARE_PARAMS = ["-api", "QuickTimeUTC", "-api", "ImageHashType=MD5"]
+
+# names present in, or already handed out for, each destination directory;
+# case-folded, as the destination may be a case-insensitive filesystem
+_DIR_NAMES: Dict[Path, set] = {}
+# names each destination directory held before this run wrote to it
+_DIR_EXISTING: Dict[Path, frozenset] = {}
+_RESERVE_LOCK = threading.Lock()
+# files that were already in each destination directory, grouped by size
+_DIR_SIZES: Dict[Path, Dict[int, List[Path]]] = {}
+# destination directories known to exist
+_MADE_DIRS: set = set()
+HASH_BLOCK = 1 << 20
+_STATS_LOCK = threading.Lock()
+
+# per-suffix [files copied, ExifTool write failures]; once a suffix keeps
+# failing, its files are re-encoded straight from the source instead
+_WRITE_FAILURES: Dict[str, List[int]] = {}
+REWRITE_MIN_FAILS = 3
+
+# Linux ioctl that shares the source extents with the target (btrfs, xfs, ...)
+FICLONE = 0x40049409
+# bytes per os.copy_file_range call
+COPY_BLOCK = 1 << 30
+# the C rm beats shutil.rmtree's Python recursion on big trees
+_RM = shutil.which("rm") if os.name == "posix" else None
 
 STREAMS: Dict[str, Dict[str, str]] = {
     "image": {
@@ -67,9 +121,75 @@ STREAMS: Dict[str, Dict[str, str]] = {
     },
 }
 
+# full tag names per stream, with and without the file name tag
+TAGS_BY_MIME: Dict[str, tuple] = {m: tuple(tags.values()) for m, tags in STREAMS.items()}
+NON_FNAME_TAGS_BY_MIME: Dict[str, tuple] = {
+    m: tuple(t for t in tags if t != "File:FileName") for m, tags in TAGS_BY_MIME.items()
+}
+
+TAGS_BY_MIME_UNION = tuple(dict.fromkeys(t for tags in TAGS_BY_MIME.values() for t in tags))
+# everything the sync reads from a source file; ExifTool skips the rest
+READ_TAGS = ["File:MIMEType", *TAGS_BY_MIME_UNION]
+
+# tag keys every stream understands, and every key accepted by -t
+COMMON_KEYS = set.intersection(*(set(m) for m in STREAMS.values()))
+ALL_KEYS = set.union(*(set(m) for m in STREAMS.values()))
+
+# MIME types trusted from the extension when no tag value has to be read
+EXT_MIME: Dict[str, str] = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".heic": "image/heic",
+    ".heif": "image/heif",
+    ".png": "image/png",
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/x-wav",
+}
+
+# ISO-BMFF brands of HEIF images and of MP4 audio, told apart from video
+HEIF_BRANDS = {b"heic", b"heix", b"heim", b"heis", b"hevc", b"hevx", b"mif1", b"msf1", b"heif"}
+AUDIO_BRANDS = {b"M4A ", b"M4B ", b"M4P "}
+
+
+def _is_movie(head: bytes) -> bool:
+    """Tell whether a file head looks like an MP4/QuickTime movie."""
+    if head[4:8] == b"ftyp":
+        return head[8:12] not in HEIF_BRANDS and head[8:12] not in AUDIO_BRANDS
+    return head[4:8] in (b"moov", b"mdat", b"wide", b"free", b"skip")
+
+
+# checks on a file's first bytes that must agree with the MIME type above
+MAGIC_CHECKS: Dict[str, Callable[[bytes], bool]] = {
+    "image/jpeg": lambda head: head.startswith(b"\xff\xd8\xff"),
+    "image/png": lambda head: head.startswith(b"\x89PNG\r\n\x1a\n"),
+    "image/heic": lambda head: head[4:8] == b"ftyp" and head[8:12] in HEIF_BRANDS,
+    "image/heif": lambda head: head[4:8] == b"ftyp" and head[8:12] in HEIF_BRANDS,
+    "video/mp4": _is_movie,
+    "video/quicktime": _is_movie,
+    "audio/mpeg": lambda head: head.startswith(b"ID3") or (
+        len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0),
+    "audio/x-wav": lambda head: head[:4] == b"RIFF" and head[8:12] == b"WAVE",
+}
+MAGIC_BYTES = 12
+
 register_heif_opener()
 
 
+@dataclass(frozen=True)
+class SyncOptions:
+    """Run-wide settings passed down to the per-file hot path."""
+    stream_key: str
+    manual_ts: Optional[str] = None
+    no_write_meta: bool = False
+    link_source: bool = False
+
+
+class AlreadySynced(RuntimeError):
+    """Raised when the destination already holds an identical copy."""
+
+
 # ------------------------------------------------------------------------
 # logging setup
 # ------------------------------------------------------------------------
@@ -80,63 +200,380 @@ def setup_logging(verbose: bool) -> None:
     )
 
 
-def cprint(msg: str, level: str = "info") -> None:
-    """Simple wrapper to log messages."""
+def cprint(level: str, fmt: str, *args) -> None:
+    """Simple wrapper to log messages; *args* are only formatted if emitted."""
     if level == "debug":
-        logging.debug(msg)
+        logging.debug(fmt, *args)
     elif level == "warn":
-        logging.warning(msg)
+        logging.warning(fmt, *args)
     elif level == "error":
-        logging.error(msg)
+        logging.error(fmt, *args)
     else:
-        logging.info(msg)
+        logging.info(fmt, *args)
 
 
 # ------------------------------------------------------------------------
 # util functions
 # ------------------------------------------------------------------------
-def get_mime(meta: dict) -> List[str]:
-    """Return a top-level MIME type from metadata."""
-    return meta.get("File:MIMEType", "").split("/", 1)
-
-
+def get_mime(meta: dict) -> Tuple[str, str]:
+    """Return the (type, subtype) pair of the MIME type in metadata."""
+    mime_type, _, mime_sub = meta.get("File:MIMEType", "").partition("/")
+    return mime_type, mime_sub
+
+
+def meta_from_suffix(path: str) -> Optional[dict]:
+    """Build minimal metadata from a well-known extension its magic bytes confirm."""
+    mime = EXT_MIME.get(os.path.splitext(path)[1].lower())
+    if not mime:
+        return None
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(MAGIC_BYTES)
+    except OSError:
+        return None  # let ExifTool report it
+    return {"File:MIMEType": mime} if MAGIC_CHECKS[mime](head) else None
+
+
+@functools.lru_cache(maxsize=16384)
 def fname_from_ts(ts: str) -> str:
     """Normalize timestamp string to 'YYYYMMDD_HHMMSS' format."""
-    return ts.replace(":", "").replace(" ", "_")[:15]
+    if not TS_RE.match(ts):
+        raise RuntimeError(f"Timestamp '{ts}' is not 'YYYY:MM:DD HH:MM:SS'")
+    return f"{ts[0:4]}{ts[5:7]}{ts[8:10]}_{ts[11:13]}{ts[14:16]}{ts[17:19]}"
+
 
+def is_fname_stem(stem: str) -> bool:
+    """Check for a 'YYYYMMDD_HHMMSS' stem with plain string tests."""
+    return (len(stem) == 15 and stem[8] == "_" and stem.isascii()
+            and stem[:8].isdigit() and stem[9:].isdigit())
 
+
+@functools.lru_cache(maxsize=16384)
 def ts_from_fname(stem: str) -> str:
     """Parse timestamp from filename stem 'YYYYMMDD_HHMMSS'."""
-    if not FNAME_RE.match(stem):
+    if not is_fname_stem(stem):
         raise RuntimeError("Filename stem must be 'YYYYMMDD_HHMMSS'")
-    dt = datetime.strptime(stem, "%Y%m%d_%H%M%S")
-    return dt.strftime("%Y:%m:%d %H:%M:%S")
+    return f"{stem[0:4]}:{stem[4:6]}:{stem[6:8]} {stem[9:11]}:{stem[11:13]}:{stem[13:15]}"
+
+
+def iter_media(root: Path, skip_top: Optional[str] = None):
+    """Yield (DirEntry, relative parts) for every file, or link to one, below *root*."""
+    stack = [(str(root), ())]
+    while stack:
+        dir_path, parts = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if not parts and entry.name == skip_top:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, parts + (entry.name,)))
+                    elif entry.is_file():
+                        yield entry, parts + (entry.name,)
+        except OSError as exc:
+            cprint("warn", "Cannot scan %s → %s", dir_path, exc)
+
+
+def collect_files(args) -> List[str]:
+    """Walk the source tree once and return the path of every file to synchronise."""
+    if args.src_file:
+        return [str(args.src_file)]
+    if args.media_files is None:
+        args.media_files = [entry.path
+                            for entry, _ in iter_media(args.src_path, args.skip_top_dir)]
+    return args.media_files
+
+
+def pick_random_file(args) -> Optional[str]:
+    """Reservoir-sample one file while walking, without listing the tree."""
+    if args.src_file:
+        return str(args.src_file)
+    picked, seen = None, 0
+    for entry, _ in iter_media(args.src_path, args.skip_top_dir):
+        seen += 1
+        if random.randrange(seen) == 0:
+            picked = entry.path
+        if seen == args.example_limit:
+            break
+    return picked
+
+
+def is_empty(path: Path) -> bool:
+    """Check whether a directory has no entries, stopping at the first one."""
+    with os.scandir(path) as it:
+        return next(it, None) is None
+
+
+def chunked(items: List, size: int):
+    """Yield consecutive slices of *items* with at most *size* elements."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _path_key(path: str) -> str:
+    """Normalise a path the way ExifTool may echo it back as SourceFile."""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def read_metadata(
+        et: ExifToolHelper,
+        files: List[str],
+) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+    """Read the tags the sync needs for many files with one ExifTool request.
+
+    Returns the metadata of every readable file and the exception for every
+    other one. Per-file errors are taken from the batch output itself; only
+    files it does not account for are read again, in halves.
+    """
+    if not files:
+        return {}, {}
+    error = None
+    try:
+        metas = et.get_tags(files, tags=READ_TAGS)
+    except ExifToolExecuteError as exc:
+        error = exc
+        try:
+            metas = json.loads(exc.stdout or "[]")
+        except ValueError:
+            metas = []
+    if error is None and len(metas) == len(files):
+        return dict(zip(files, metas)), {}
+
+    found = {_path_key(m.get("SourceFile", "")): m for m in metas}
+    result, failures, missing = {}, {}, []
+    for f in files:
+        meta = found.get(_path_key(f))
+        if meta is None:
+            missing.append(f)
+        elif meta.get("ExifTool:Error"):
+            failures[f] = RuntimeError(meta["ExifTool:Error"])
+        else:
+            result[f] = meta
+
+    if len(files) == 1:
+        if missing:
+            failures[files[0]] = error or RuntimeError("ExifTool returned no metadata")
+        return result, failures
+    if len(missing) == len(files):
+        half = len(files) // 2
+        parts = [files[:half], files[half:]]
+    else:
+        parts = [missing]
+    for part in parts:
+        part_result, part_failures = read_metadata(et, part)
+        result.update(part_result)
+        failures.update(part_failures)
+    return result, failures
+
+
+def bump(stats: Dict[str, int], key: str) -> None:
+    """Increment a counter shared between worker threads."""
+    with _STATS_LOCK:
+        stats[key] += 1
+
+
+def ensure_dir(path: str) -> None:
+    """Create a directory tree once per run; repeat calls are a set lookup."""
+    if path not in _MADE_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _MADE_DIRS.add(path)
+
+
+def _dir_names(dst_dir: Path) -> set:
+    """Return the cached name set of a destination directory (lock held)."""
+    names = _DIR_NAMES.get(dst_dir)
+    if names is None:
+        try:
+            names = {n.casefold() for n in os.listdir(dst_dir)}
+        except FileNotFoundError:
+            names = set()
+        _DIR_NAMES[dst_dir] = names
+        _DIR_EXISTING[dst_dir] = frozenset(names)
+    return names
 
 
 def ensure_unique(path: Path) -> Path:
     """Generate a unique Path by appending incrementing suffix if needed."""
-    if not path.exists():
-        return path
-    i = 1
-    while True:
-        candidate = path.with_name(f"{path.stem}_{i}{path.suffix}")
-        if not candidate.exists():
-            return candidate
-        i += 1
+    with _RESERVE_LOCK:
+        names = _dir_names(path.parent)
+        name = path.name
+        i = 1
+        while name.casefold() in names:
+            name = f"{path.stem}_{i}{path.suffix}"
+            i += 1
+        names.add(name.casefold())
+        return path.with_name(name)
+
+
+@functools.lru_cache(maxsize=4096)
+def file_digest(path: Path, size: int, mtime_ns: int) -> bytes:
+    """MD5 of a file, cached by path, size and modification time."""
+    digest = hashlib.md5()
+    with open(path, "rb") as fh:
+        while block := fh.read(HASH_BLOCK):
+            digest.update(block)
+    return digest.digest()
+
+
+def find_duplicate(src: str, target: Path) -> Optional[Path]:
+    """Return a file already in *target*'s directory with the same bytes as *src*.
+
+    Only consulted with --no-write-meta, where a synced copy keeps the source
+    bytes, and when *target* itself is taken; sizes are compared first so
+    hashing is limited to real candidates. Candidates are limited to files
+    that were there before this run, so staged or uncommitted copies never
+    count as a match.
+    """
+    with _RESERVE_LOCK:
+        if target.name.casefold() not in _dir_names(target.parent):
+            return None
+        sizes = _DIR_SIZES.get(target.parent)
+        if sizes is None:
+            existing = _DIR_EXISTING[target.parent]
+            sizes = {}
+            with os.scandir(target.parent) as it:
+                for entry in it:
+                    if (entry.name.casefold() in existing and not is_staging_name(entry.name)
+                            and entry.is_file(follow_symlinks=False)):
+                        sizes.setdefault(entry.stat().st_size, []).append(Path(entry.path))
+            _DIR_SIZES[target.parent] = sizes
+
+    st = os.stat(src)
+    candidates = sizes.get(st.st_size)
+    if not candidates:
+        return None
+    src_digest = file_digest(src, st.st_size, st.st_mtime_ns)
+    for cand in candidates:
+        try:
+            cst = cand.stat()
+            if file_digest(cand, cst.st_size, cst.st_mtime_ns) == src_digest:
+                return cand
+        except OSError:
+            continue  # gone or unreadable: not a duplicate
+    return None
+
+
+def release_name(path: Path) -> None:
+    """Forget a destination name after the file behind it was removed."""
+    with _RESERVE_LOCK:
+        _DIR_NAMES.get(path.parent, set()).discard(path.name.casefold())
+
+
+def copy_file(src: str, dst: Path, link: bool = False, keep_stat: bool = True) -> None:
+    """Copy a file using the cheapest way the OS offers.
+
+    With *link* the file is hard-linked when source and target share a
+    filesystem; callers only ask for that when whatever later writes to *dst*
+    replaces the file, so the source inode stays intact. Permission bits are
+    always copied, timestamps and the rest of the stat info only with
+    *keep_stat*, since tagged copies get their dates rewritten anyway.
+    """
+    if link:
+        try:
+            dst.unlink(missing_ok=True)
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            if fcntl is None:
+                raise OSError("no FICLONE")
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            copied = True
+        except OSError:
+            copied = False
+        if not copied and hasattr(os, "copy_file_range"):
+            size = os.fstat(fsrc.fileno()).st_size
+            done = 0
+            try:
+                # some filesystems answer 0 instead of failing, so a short
+                # copy falls through to a plain one instead of passing as done
+                while done < size:
+                    sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_BLOCK)
+                    if not sent:
+                        break
+                    done += sent
+                copied = done == size
+            except OSError:
+                pass
+    if not copied:
+        shutil.copyfile(src, dst)
+    if keep_stat:
+        shutil.copystat(src, dst)
+    else:
+        shutil.copymode(src, dst)
 
 
-def convert_photo_to_jpg(src_path: Path):
-    jpg_path = src_path.with_suffix('.jpg')
-    unique_jpg = ensure_unique(jpg_path)
+def remove_entry(entry: os.DirEntry) -> None:
+    """Delete one directory entry, handing whole trees to rm -rf where present."""
+    if not entry.is_dir(follow_symlinks=False):
+        os.unlink(entry.path)
+    elif _RM is not None:
+        import subprocess
 
-    img = Image.open(src_path)
+        result = subprocess.run([_RM, "-rf", "--", entry.path],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if result.returncode != 0:
+            shutil.rmtree(entry.path)  # surfaces the actual error
+    else:
+        shutil.rmtree(entry.path)
 
-    if img.mode != 'RGB':
-        img = img.convert('RGB')
 
-    img.save(unique_jpg, format="JPEG", quality=100, subsampling=0, optimize=False)
-    src_path.unlink()
-    return unique_jpg
+def wipe_dir(path: Path, jobs: int) -> None:
+    """Empty a directory, removing its top-level entries in parallel."""
+    with os.scandir(path) as it:
+        entries = list(it)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for job in [pool.submit(remove_entry, e) for e in entries]:
+            job.result()
+
+
+def note_write(suffix: str, failed: bool = False) -> None:
+    """Record a copied file or a failed tag write for a file suffix."""
+    with _STATS_LOCK:
+        counts = _WRITE_FAILURES.setdefault(suffix.lower(), [0, 0])
+        counts[failed] += 1
+
+
+def needs_rewrite(suffix: str) -> bool:
+    """Tell whether files with this suffix mostly need re-encoding."""
+    copied, failed = _WRITE_FAILURES.get(suffix.lower(), (0, 0))
+    return failed >= REWRITE_MIN_FAILS and failed * 2 >= copied
+
+
+def is_jpeg(path: str) -> bool:
+    """Tell whether a file starts with the JPEG SOI marker."""
+    with open(path, "rb") as fh:
+        return fh.read(3) == b"\xff\xd8\xff"
+
+
+def encode_jpeg(src, dst) -> None:
+    """Decode an image and save it as a full-quality baseline JPEG."""
+    pixels = None
+    if _TURBO is not None and os.path.splitext(src)[1].lower() in (".jpg", ".jpeg"):
+        try:
+            with open(src, "rb") as fh:
+                data = fh.read()
+            pixels = _TURBO.decode(data, pixel_format=TJPF_RGB,
+                                   flags=TJFLAG_ACCURATEDCT)
+        except OSError:
+            pass  # not really a JPEG, let Pillow sort it out
+
+    if pixels is None:
+        with Image.open(src) as img:
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            if _TURBO is None:
+                img.save(dst, format="JPEG", quality=100, subsampling=0, optimize=False,
+                         progressive=False)
+                return
+            pixels = np.asarray(img)
+
+    with open(dst, "wb") as fh:
+        fh.write(_TURBO.encode(pixels, quality=100, pixel_format=TJPF_RGB,
+                               jpeg_subsample=TJSAMP_444, flags=TJFLAG_ACCURATEDCT))
 
 
 def convert_video_to_mp4(src_path: Path) -> Path:
@@ -157,6 +594,7 @@ def convert_video_to_mp4(src_path: Path) -> Path:
         raise RuntimeError(f"Failed to convert video: {src_path.name}")
 
     src_path.unlink()
+    release_name(src_path)
     return unique_mp4
 
 
@@ -176,6 +614,8 @@ def parse_cli(argv: Optional[list[str]] = None):
     p.add_argument("-d", "--destination", dest="dst_folder", default=DEFAULT_DST)
     p.add_argument("-a", "--all", action="store_true",
                    help="print full metadata in example mode")
+    p.add_argument("--example-limit", type=int, metavar="N",
+                   help="pick the random example among the first N files only")
     p.add_argument("-v", "--verbose", action="store_true",
                    help="enable debug output")
     p.add_argument("-m", "--manual", dest="manual_ts_raw", metavar="YYYYMMDD_HHMMSS",
@@ -186,30 +626,40 @@ def parse_cli(argv: Optional[list[str]] = None):
                    help="skip writing metadata tags")
     p.add_argument("-r", "--remove-source", action="store_true",
                    help="delete source files after syncing")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                   help="parallel copy/convert workers (default: CPU count)")
+    p.add_argument("-b", "--batch-size", type=int, default=BATCH_SIZE, metavar="N",
+                   help=f"files per ExifTool read/write batch (default {BATCH_SIZE})")
 
     args = p.parse_args(argv)
     args.remove_source = args.remove_source
-    global _VERBOSE, _NO_WRITE_META
-    _VERBOSE = args.verbose
-    _NO_WRITE_META = args.no_write_meta
-
-    setup_logging(_VERBOSE)
+    setup_logging(args.verbose)
 
     if args.manual_ts_raw:
         if args.example is not None or args.type_key:
             p.error("-m/--manual cannot be combined with -e/--example or -t/--type")
-        if not FNAME_RE.match(args.manual_ts_raw):
+        if not is_fname_stem(args.manual_ts_raw):
             p.error("-m must match YYYYMMDD_HHMMSS")
-        args.manual_ts = datetime.strptime(
-            args.manual_ts_raw, "%Y%m%d_%H%M%S"
-        ).strftime("%Y:%m:%d %H:%M:%S")
+        args.manual_ts = ts_from_fname(args.manual_ts_raw)
     else:
         args.manual_ts = None
 
+    if args.jobs < 1:
+        p.error("-j/--jobs must be at least 1")
+    if args.batch_size < 1:
+        p.error("-b/--batch-size must be at least 1")
+    if args.example_limit is not None and args.example_limit < 1:
+        p.error("--example-limit must be at least 1")
     if args.type_key is None and args.example is None and args.manual_ts_raw is None:
         p.error("either -t/--type, -e/--example, or -m/--manual is required")
     if args.example is not None and args.type_key is not None and args.all:
         p.error("-a cannot be used with -t when -e is given")
+    if args.type_key is not None and args.type_key not in ALL_KEYS:
+        p.error(f"-t must be one of: {', '.join(sorted(ALL_KEYS))}")
+    if args.type_key is not None and args.type_key not in COMMON_KEYS:
+        streams = [m for m, tags in STREAMS.items() if args.type_key in tags]
+        cprint("warn", "Tag '%s' only exists for %s files, others will be skipped",
+               args.type_key, "/".join(streams))
 
     spath = Path(args.src_folder).expanduser()
     spath = spath if spath.is_absolute() else Path(DEFAULT_SRC) / spath
@@ -230,6 +680,7 @@ def parse_cli(argv: Optional[list[str]] = None):
             args.skip_top_dir = None
     else:
         args.skip_top_dir = None
+    args.media_files = None
 
     return args
 
@@ -237,81 +688,365 @@ def parse_cli(argv: Optional[list[str]] = None):
 # ------------------------------------------------------------------------
 # core synchronisation
 # ------------------------------------------------------------------------
-def synchronise_file(
-        src_file: Path,
-        src_root: Path,
-        dst_root: Path,
+def plan_file(
+        src_file: str,
         stream_key: str,
-        et: ExifToolHelper,
-        stats: Dict[str, int],
+        meta: dict,
         manual_ts: Optional[str] = None,
 ):
-    """Copy one file atomically and sync all related metadata tags."""
-    meta = et.get_metadata(str(src_file))[0]
+    """Work out target name and timestamp for one file without touching disk.
+
+    Returns ``(base_name, mime, tags, main_tag, main_val)`` where *tags* are
+    the tags to write, so later stages need no further MIME lookups.
+    """
     mime = get_mime(meta)
     tag_map = STREAMS.get(mime[0])
     if not tag_map:
         raise RuntimeError(f"Unknown MIME '{mime[0]} with type '{mime[1]}'")
+    stem, suffix = os.path.splitext(os.path.basename(src_file))
 
     if stream_key == 'manual':
         main_tag = "File:Manual"
         main_val = manual_ts
     elif stream_key == "fname":
         main_tag = tag_map[stream_key]
-        main_val = ts_from_fname(src_file.stem)
+        main_val = ts_from_fname(stem)
     else:
         main_tag = tag_map[stream_key]
         main_val = meta.get(main_tag)
         if not main_val:
             raise RuntimeError(f"File has no tag {main_tag}")
 
-    old_vals = {tag: meta.get(tag) for tag in tag_map.values()}
-
-    rel = src_file.relative_to(src_root)
-    dst_dir = dst_root / rel.parent
-    dst_dir.mkdir(parents=True, exist_ok=True)
-
     if stream_key == "fname":
-        base_name = src_file.stem + src_file.suffix.lower()
+        base_name = stem + suffix.lower()
     else:
-        base_name = fname_from_ts(main_val) + src_file.suffix.lower()
-    new_path = ensure_unique(dst_dir / base_name)
+        base_name = fname_from_ts(main_val) + suffix.lower()
+
+    return base_name, mime, NON_FNAME_TAGS_BY_MIME[mime[0]], main_tag, main_val
 
-    shutil.copy2(src_file, new_path)
 
+def target_name(base_name: str, mime: Tuple[str, str]) -> str:
+    """Return the destination file name a planned file ends up with."""
     if mime[0] == 'image' and mime[1] != 'jpeg':
+        return os.path.splitext(base_name)[0] + ".jpg"
+    return base_name
+
+
+def names_by_stem(dst_dir: str) -> Dict[Tuple[str, str], List[str]]:
+    """Group a directory's file names by case-folded stem and suffix.
+
+    A name ending in ``_N`` is listed under its stem without the counter as
+    well, next to the name ensure_unique would have planned.
+    """
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    try:
+        with os.scandir(dst_dir) as it:
+            names = sorted(e.name for e in it
+                           if e.is_file(follow_symlinks=False) and not is_staging_name(e.name))
+    except OSError:
+        return groups
+    for name in names:
+        stem, suffix = os.path.splitext(name)
+        key_suffix = suffix.casefold()
+        groups.setdefault((stem.casefold(), key_suffix), []).append(name)
+        base, sep, counter = stem.rpartition("_")
+        if sep and counter.isdigit():
+            groups.setdefault((base.casefold(), key_suffix), []).append(name)
+    return groups
+
+
+def find_up_to_date(
+        et: ExifToolHelper,
+        args,
+        plans: Dict[str, tuple],
+) -> Dict[str, Path]:
+    """Map source files to destination files that already carry their tags.
+
+    Both sides are read in one ExifTool batch; a target counts as synced when
+    its media data matches the source and its timestamps are the planned
+    ones. Files without an ImageDataHash (audio) are compared by size and
+    digest instead. The planned name and its ``_N`` variants are all tried,
+    so files sharing a timestamp find their own copy; copies re-encoded to
+    JPEG never match the source data and are not detected.
+    """
+    listings: Dict[str, Dict[Tuple[str, str], List[str]]] = {}
+    targets = {}
+    for f, (base_name, mime, tag_tuple, _, main_val) in plans.items():
+        dst_dir = os.path.join(args.dst_path, os.path.dirname(os.path.relpath(f, args.src_path)))
+        if dst_dir not in listings:
+            listings[dst_dir] = names_by_stem(dst_dir)
+        stem, suffix = os.path.splitext(target_name(base_name, mime))
+        names = listings[dst_dir].get((stem.casefold(), suffix.casefold()))
+        if names:
+            targets[f] = ([Path(dst_dir, n) for n in names], tag_tuple, main_val)
+    if not targets:
+        return {}
+
+    # sources and their candidates in one read; files sharing a timestamp
+    # share candidates, so each path is read once
+    paths = list(dict.fromkeys(
+        os.fspath(p) for f, (candidates, _, _) in targets.items() for p in (f, *candidates)))
+    tags = list(TAGS_BY_MIME_UNION) + ["ImageDataHash"]
+    try:
+        found = et.get_tags(paths, tags=tags, params=COMPARE_PARAMS)
+    except ExifToolExecuteError:
+        return {}
+    if len(found) != len(paths):
+        return {}
+    read = dict(zip(paths, found))
+
+    def data_hash(tags_read: dict):
+        return next((v for k, v in tags_read.items() if k.endswith("ImageDataHash")), None)
+
+    def same_bytes(src: str, dst: Path) -> bool:
         try:
-            new_path = convert_photo_to_jpg(new_path)
-            stats["converted_jpg"] += 1
-        except Exception:
-            raise
-    # elif mime[0] == 'video' and new_path.suffix.lower() != '.mp4':
-    #     try:
-    #         new_path = convert_video_to_mp4(new_path)
-    #         stats["converted_mp4"] += 1
-    #     except Exception:
-    #         raise
-
-    if not _NO_WRITE_META:
-        params = ["-overwrite_original", "-api", "QuickTimeUTC"]
-        other_tags = {tag: main_val for tag in tag_map.values()}
-        other_tags["File:FileName"] = new_path.name
+            sst, dst_st = os.stat(src), dst.stat()
+            return (sst.st_size == dst_st.st_size
+                    and file_digest(src, sst.st_size, sst.st_mtime_ns)
+                    == file_digest(dst, dst_st.st_size, dst_st.st_mtime_ns))
+        except OSError:
+            return False
+
+    # main_val is what gets written; read back through the same QuickTimeUTC
+    # setting it comes out as that local time plus a zone, so dates are
+    # matched on their leading date/time part
+    result = {}
+    for f, (candidates, tag_tuple, main_val) in targets.items():
+        src_hash = data_hash(read[f])
+        for target in candidates:
+            dst_tags = read[os.fspath(target)]
+            if src_hash is not None:
+                if src_hash != data_hash(dst_tags):
+                    continue
+            elif not same_bytes(f, target):
+                continue
+            if all(str(dst_tags.get(t, "")).startswith(main_val) for t in tag_tuple
+                   if t == "File:FileModifyDate" or not t.startswith("File:")):
+                result[f] = target
+                break
+    return result
+
+
+def staging_path(path: Path) -> Path:
+    """Return the hidden name a file is prepared under before it goes live."""
+    return path.with_name(f".{path.stem}.tmp{path.suffix}")
+
 
+def is_staging_name(name: str) -> bool:
+    """Tell whether a file name has the shape staging_path gives it."""
+    return name.startswith(".") and (".tmp." in name or name.endswith(".tmp"))
+
+
+def discard_staged(stage: Path, final: Path) -> None:
+    """Drop a staged file and give its reserved final name back."""
+    stage.unlink(missing_ok=True)
+    release_name(final)
+
+
+def write_tags(
+        et: ExifToolHelper,
+        path: Path,
+        tags: Dict[str, str],
+        stats: Dict[str, int],
+        plain_failed: bool = False,
+) -> None:
+    """Write tags to one file, retrying with -m and then after a re-encode.
+
+    With *plain_failed* the plain write already failed elsewhere (in a
+    batch) and is not repeated.
+    """
+    if not plain_failed:
         try:
-            et.set_tags([str(new_path)], tags=other_tags, params=params)
+            et.set_tags([str(path)], tags=tags, params=WRITE_PARAMS)
+            return
         except ExifToolExecuteError:
-            cprint("Reconverting JPG", "warn")
-            shutil.copy2(new_path, new_path.with_suffix(".JPG"))
-            new_path.unlink()
-            convert_photo_to_jpg(new_path.with_suffix(".JPG"))
-            stats["converted_jpg"] += 1
-            try:
-                et.set_tags([str(new_path)], tags=other_tags, params=params)
-            except ExifToolExecuteError:
-                new_path.unlink()
-                raise
+            pass
+
+    try:
+        et.set_tags([str(path)], tags=tags, params=WRITE_PARAMS + ["-m"])
+        bump(stats, "retry_ignore_minor")
+    except ExifToolExecuteError:
+        cprint("warn", "Reconverting JPG")
+        note_write(path.suffix, failed=True)
+        redo = staging_path(path)
+        try:
+            encode_jpeg(path, redo)
+            os.replace(redo, path)
+        finally:
+            redo.unlink(missing_ok=True)
+        bump(stats, "converted_jpg")
+        et.set_tags([str(path)], tags=tags, params=WRITE_PARAMS)
+
+
+def flush_tag_writes(
+        et: ExifToolHelper,
+        pending: List,
+        stats: Dict[str, int],
+) -> Dict[Path, Exception]:
+    """Write all queued tag sets through one ExifTool argfile run.
+
+    Only files ExifTool reports an error for are retried one by one.
+    Returns the exception raised for every staged file that could not be tagged.
+    """
+    if not pending:
+        return {}
+
+    with tempfile.NamedTemporaryFile("w", suffix=".args", encoding="utf-8",
+                                     delete=False) as fh:
+        for i, (stage, _, tags) in enumerate(pending):
+            if i:
+                fh.write("-execute\n")
+            fh.writelines(f"{param}\n" for param in WRITE_PARAMS)
+            fh.writelines(f"-{tag}={val}\n" for tag, val in tags.items())
+            fh.write(f"{stage}\n")
+        argfile = fh.name
+
+    failed_status = False
+    try:
+        et.execute("-@", argfile)
+    except ExifToolExecuteError:
+        failed_status = True
+    finally:
+        Path(argfile).unlink()
+    errors = [line for line in (et.last_stderr or "").splitlines()
+              if line.startswith("Error")]
+    if failed_status and not errors:
+        errors = ["Error"]  # failed without saying where
+    if not errors:
+        return {}
+
+    # ExifTool ends each error with " - FILE"; only those files are redone
+    named = {line.rpartition(" - ")[2].strip() for line in errors}
+    retry = [entry for entry in pending if str(entry[0]) in named]
+    if len(retry) < len(named) and len(pending) > 1:
+        # an error without a usable file name: split the batch to find it
+        half = len(pending) // 2
+        failures = flush_tag_writes(et, pending[:half], stats)
+        failures.update(flush_tag_writes(et, pending[half:], stats))
+        return failures
+
+    failures = {}
+    for stage, _, tags in retry or pending:
+        try:
+            write_tags(et, stage, tags, stats, plain_failed=True)
+        except Exception as exc:
+            failures[stage] = exc
+    return failures
+
+
+def copy_and_convert(
+        src: str,
+        dst: Path,
+        to_jpeg: bool,
+        encoder: Optional[Executor] = None,
+        link: bool = False,
+        keep_stat: bool = True,
+) -> None:
+    """Place the data of *src* at *dst*, re-encoding to JPEG when asked."""
+    if not to_jpeg:
+        copy_file(src, dst, link, keep_stat)
+    elif encoder is None:
+        encode_jpeg(src, dst)
+    else:
+        encoder.submit(encode_jpeg, src, dst).result()
 
-    return new_path, main_tag, main_val, old_vals
+
+def link_safe(opts: SyncOptions, meta: dict, tags: tuple, main_val: str) -> bool:
+    """Tell whether a staged hard link gets replaced before anything touches it.
+
+    ExifTool only rewrites (and so re-creates) a file when an embedded tag
+    changes; File: dates alone, or values that already match, are set on the
+    inode in place, which would alter the linked source as well. QuickTime
+    values are written through QuickTimeUTC, so a raw mismatch does not prove
+    a change and they are not counted.
+    """
+    if opts.no_write_meta:
+        return True
+    return any(t in meta and meta[t] != main_val
+               for t in tags if not t.startswith(("File:", "QuickTime:")))
+
+
+def synchronise_file(
+        src_file: str,
+        src_root: str,
+        dst_root: str,
+        opts: SyncOptions,
+        et: ExifToolHelper,
+        stats: Dict[str, int],
+        meta: Optional[dict] = None,
+        plan: Optional[tuple] = None,
+        pending: Optional[List] = None,
+        encoder: Optional[Executor] = None,
+):
+    """Copy one file and sync all related metadata tags.
+
+    The file is prepared under a staging name and only renamed to its final
+    name once tagged. When *pending* is given the tag write is queued there
+    as ``(stage, final, tags)`` and the rename is left to the caller. Image
+    re-encodes run on *encoder* when one is given; *plan* is the result of
+    plan_file when the caller already has it.
+    """
+    if meta is None:
+        meta = et.get_tags(src_file, tags=READ_TAGS)[0]
+    if plan is None:
+        plan = plan_file(src_file, opts.stream_key, meta, opts.manual_ts)
+    base_name, mime, tag_tuple, main_tag, main_val = plan
+
+    # previous values are only worth collecting when they get logged
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        cprint("debug", "Old tags of %s: %s", os.path.basename(src_file),
+               {tag: meta.get(tag) for tag in TAGS_BY_MIME[mime[0]]})
+
+    rel_dir = os.path.dirname(os.path.relpath(src_file, src_root))
+    dst_dir = os.path.join(dst_root, rel_dir) if rel_dir else dst_root
+    ensure_dir(dst_dir)
+
+    # decode straight from the source when a copy would only be re-encoded
+    # (a "non-JPEG" that already holds JPEG data only needs the new suffix)
+    # write outcomes are tracked per copy suffix, the one ExifTool gets to see
+    name = target_name(base_name, mime)
+    reencode = mime[0] == 'image' and (
+        (mime[1] != 'jpeg' and not is_jpeg(src_file))
+        or (not opts.no_write_meta and needs_rewrite(os.path.splitext(name)[1])))
+    if reencode:
+        new_path = ensure_unique(Path(dst_dir, os.path.splitext(base_name)[0] + ".jpg"))
+    else:
+        target = Path(dst_dir, name)
+        # identical bytes only prove a finished copy when no tags get written;
+        # tagged copies are matched by find_up_to_date instead
+        if opts.no_write_meta:
+            duplicate = find_duplicate(src_file, target)
+            if duplicate is not None:
+                raise AlreadySynced(duplicate)
+        new_path = ensure_unique(target)
+    stage = staging_path(new_path)
+
+    try:
+        copy_and_convert(src_file, stage, reencode, encoder,
+                         opts.link_source and link_safe(opts, meta, tag_tuple, main_val),
+                         keep_stat=opts.no_write_meta)
+        if reencode:
+            bump(stats, "converted_jpg")
+        else:
+            note_write(new_path.suffix)
+        # elif mime[0] == 'video' and new_path.suffix.lower() != '.mp4':
+        #     new_path = convert_video_to_mp4(new_path)
+        #     bump(stats, "converted_mp4")
+
+        if opts.no_write_meta:
+            os.replace(stage, new_path)
+        else:
+            other_tags = dict.fromkeys(tag_tuple, main_val)
+            if pending is None:
+                write_tags(et, stage, other_tags, stats)
+                os.replace(stage, new_path)
+            else:
+                pending.append((stage, new_path, other_tags))
+    except Exception:
+        discard_staged(stage, new_path)
+        raise
+
+    return new_path, main_tag, main_val
 
 
 # ------------------------------------------------------------------------
@@ -320,13 +1055,11 @@ def synchronise_file(
 def show_example_info(args):
     """Example mode: show metadata for one random or specified file."""
     if args.example == "":
-        files = [f for f in args.src_path.rglob("*")
-                 if f.is_file() and not (args.skip_top_dir and
-                                         f.relative_to(args.src_path).parts[0] == args.skip_top_dir)]
-        if not files:
+        picked = pick_random_file(args)
+        if picked is None:
             sys.exit("No files for example")
-        file_path = random.choice(files)
-        cprint(f"Random file selected: {file_path.relative_to(args.src_path)}", "info")
+        file_path = Path(picked)
+        cprint("info", "Random file selected: %s", file_path.relative_to(args.src_path))
     else:
         file_path = Path(args.example)
         if not file_path.is_absolute():
@@ -344,12 +1077,11 @@ def show_example_info(args):
         full_tag = tag_map.get(args.type_key)
 
         if full_tag:
-            cprint(f"{full_tag}: {meta.get(full_tag)}", "info")
+            cprint("info", "%s: %s", full_tag, meta.get(full_tag))
         else:
-            cprint("Requested tag not applicable to this file", "warn")
+            cprint("warn", "Requested tag not applicable to this file")
         return
 
-    import json
     if args.all:
         print(json.dumps(meta, indent=2, ensure_ascii=False))
     else:
@@ -361,26 +1093,147 @@ def show_example_info(args):
 # ------------------------------------------------------------------------
 # batch mode
 # ------------------------------------------------------------------------
+def read_stage(args, opts: SyncOptions, out: queue.Queue) -> None:
+    """Pipeline stage: read metadata in batches and queue files for copying.
+
+    Puts ``(kind, file, payload)`` items on *out* and ``None`` once done; kind
+    is "sync" (payload: metadata and plan), "same" (existing copy), "fail" or
+    "abort" (payload: exception).
+    """
+    # fname/manual modes only need the MIME type, which the extension gives
+    # once the file's first bytes agree with it
+    probe_all = opts.stream_key not in ("fname", "manual")
+    try:
+        with ExifToolHelper() as et:
+            for chunk in chunked(collect_files(args), args.batch_size):
+                guessed = {} if probe_all else {f: meta_from_suffix(f) for f in chunk}
+                metas, errors = read_metadata(et, [f for f in chunk if not guessed.get(f)])
+                ready = {}
+                for f in chunk:
+                    try:
+                        meta = metas.get(f) or guessed.get(f)
+                        if meta is None:
+                            raise errors[f]
+                        ready[f] = meta, plan_file(f, opts.stream_key, meta, opts.manual_ts)
+                    except Exception as exc:
+                        out.put(("fail", f, exc))
+
+                up_to_date = {} if opts.no_write_meta else find_up_to_date(
+                    et, args, {f: plan for f, (_, plan) in ready.items()})
+                for f, payload in ready.items():
+                    if f in up_to_date:
+                        out.put(("same", f, up_to_date[f]))
+                    else:
+                        out.put(("sync", f, payload))
+    except Exception as exc:
+        out.put(("abort", None, exc))
+    finally:
+        out.put(None)
+
+
+def sync_job(*args, **kwargs):
+    """Worker wrapper around synchronise_file that returns its queued writes."""
+    queued: List = []
+    result = synchronise_file(*args, **kwargs, pending=queued)
+    return result, queued
+
+
+def remove_source_file(f: str, rel: str, touched: Set[str],
+                       stats: Dict[str, int]) -> None:
+    """Delete a synced source file and remember its directory for pruning."""
+    try:
+        os.unlink(f)
+        stats["removed"] += 1
+        cprint("info", "REMOVED %s", rel)
+        touched.add(os.path.dirname(f))
+    except Exception as e:
+        cprint("warn", "Failed to remove %s: %s", rel, e)
+
+
+def prune_dirs(args, touched: Set[str], stats: Dict[str, int]) -> None:
+    """Remove source directories left empty, deepest first."""
+    root = str(args.src_path)
+    dirs = set()
+    for d in touched:
+        # each ancestor is visited once, so emptied parents go as well
+        while d != root and d.startswith(root) and d not in dirs:
+            dirs.add(d)
+            d = os.path.dirname(d)
+
+    for d in sorted(dirs, key=lambda d: d.count(os.sep), reverse=True):
+        try:
+            os.rmdir(d)
+        except OSError:
+            continue  # not empty (or gone); rmdir is the emptiness check
+        stats["removed_dirs"] += 1
+        cprint("info", "REMOVED DIR %s", os.path.relpath(d, root))
+
+
+def skip_synced(args, f: str, rel: str, existing: Path, touched: Set[str],
+                stats: Dict[str, int]) -> None:
+    """Account for a source file whose synced copy is already in place."""
+    cprint("info", "SAME %s → %s", rel, os.path.relpath(existing, args.dst_path))
+    stats["skipped"] += 1
+    if args.remove_source:
+        remove_source_file(f, rel, touched, stats)
+
+
+def commit_synced(args, et: ExifToolHelper, pending: List, synced: List,
+                  touched: Set[str], stats: Dict[str, int]) -> None:
+    """Flush queued tag writes and move the tagged files to their final names."""
+    failures = flush_tag_writes(et, pending, stats)
+    stages = {final: stage for stage, final, _ in pending}
+    for f, rel, new_file, tag_full, val in synced:
+        stage = stages.get(new_file)
+        try:
+            if stage is not None:
+                if stage in failures:
+                    raise failures[stage]
+                os.replace(stage, new_file)
+        except Exception as exc:
+            if stage is not None:
+                discard_staged(stage, new_file)
+            cprint("warn", "Skip %s → %s", rel, exc)
+            stats["failed"] += 1
+            continue
+
+        cprint("info", "OK %s → %s (%s = %s)",
+               rel, os.path.relpath(new_file, args.dst_path), tag_full, val)
+
+        if args.remove_source:
+            remove_source_file(f, rel, touched, stats)
+
+    pending.clear()
+    synced.clear()
+
+
+def discard_uncommitted(pending: List, jobs: Dict) -> None:
+    """Drop staged files, queued or still held by finished jobs, that never went live."""
+    for job in jobs:
+        if job.done() and not job.cancelled() and job.exception() is None:
+            pending.extend(job.result()[1])
+    for stage, final, _ in pending:
+        discard_staged(stage, final)
+    pending.clear()
+
+
 def run_batch_sync(args):
     """Batch mode: sync all files under source to destination."""
     stats = {
         "processed": 0,
         "converted_jpg": 0,
         "converted_mp4": 0,
+        "retry_ignore_minor": 0,
         "failed": 0,
         "skipped": 0,
         "removed": 0,
         "removed_dirs": 0,
     }
 
-    if args.dst_path.exists() and any(args.dst_path.iterdir()):
+    if args.dst_path.exists() and not is_empty(args.dst_path):
         if args.force:
-            cprint("Force wipe: removing existing destination content", "warn")
-            for item in args.dst_path.iterdir():
-                if item.is_dir():
-                    shutil.rmtree(item)
-                else:
-                    item.unlink()
+            cprint("warn", "Force wipe: removing existing destination content")
+            wipe_dir(args.dst_path, args.jobs)
         else:
             resp = input(
                 f"Destination '{args.dst_path}' is not empty.\n"
@@ -392,55 +1245,93 @@ def run_batch_sync(args):
             if resp not in {"y", "c"}:
                 sys.exit("Aborted by user")
             if resp == "c":
-                cprint("Wiping destination folder…", "warn")
-                for item in args.dst_path.iterdir():
-                    if item.is_dir():
-                        shutil.rmtree(item)
-                    else:
-                        item.unlink()
+                cprint("warn", "Wiping destination folder…")
+                wipe_dir(args.dst_path, args.jobs)
     else:
-        args.dst_path.mkdir(parents=True, exist_ok=True)
+        ensure_dir(str(args.dst_path))
 
     with ExifToolHelper() as et:
-        stream_key = "manual" if args.manual_ts else args.type_key
-
-        cprint(f"Using tag: {stream_key}", "info")
-
-        file_iter = [args.src_file] if args.src_file else args.src_path.rglob("*")
-        for f in file_iter:
-            rel = f.relative_to(args.src_path)
-            if not f.is_file() or (args.skip_top_dir and rel.parts[0] == args.skip_top_dir):
-                continue
-            try:
-                stats["processed"] += 1
-                new_file, tag_full, val, old_vals = synchronise_file(
-                    f, args.src_path, args.dst_path, stream_key, et, stats, args.manual_ts)
-            except Exception as exc:
-                cprint(f"Skip {rel} → {exc}", "warn")
-                stats["failed"] += 1
-                continue
-
-            cprint(f"OK {rel} → {new_file.relative_to(args.dst_path)} ({tag_full} = {val})", "info")
-
-            if args.remove_source:
+        opts = SyncOptions(
+            stream_key="manual" if args.manual_ts else args.type_key,
+            manual_ts=args.manual_ts,
+            no_write_meta=args.no_write_meta,
+            link_source=args.remove_source,
+        )
+
+        cprint("info", "Using tag: %s", opts.stream_key)
+
+        # three overlapping stages: a reader thread with its own ExifTool
+        # process, the copy/encode pools, and tag writes on this thread
+        meta_q: queue.Queue = queue.Queue(maxsize=QUEUE_DEPTH)
+        reader = threading.Thread(target=read_stage, args=(args, opts, meta_q), daemon=True)
+
+        # decode/encode is CPU bound, so it gets processes; copies get threads.
+        # Workers never fork from this process once its threads are running.
+        methods = multiprocessing.get_all_start_methods()
+        encoder = ProcessPoolExecutor(
+            max_workers=args.jobs,
+            mp_context=multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"))
+        reader.start()
+
+        pending: List = []
+        synced: List = []
+        touched: Set[str] = set()
+        jobs = {}
+
+        def collect(done) -> None:
+            for job in done:
+                f, rel = jobs.pop(job)
                 try:
-                    f.unlink()
-                    stats["removed"] += 1
-                    cprint(f"REMOVED {rel}", "info")
-                    parent = f.parent
-
-                    while parent != args.src_path and not any(parent.iterdir()):
-                        parent_rel = parent.relative_to(args.src_path)
-                        parent.rmdir()
-                        stats["removed_dirs"] += 1
-                        cprint(f"REMOVED DIR {parent_rel}", "info")
-                        parent = parent.parent
-                except Exception as e:
-                    cprint(f"Failed to clean up {rel} or its dirs: {e}", "warn")
-
-    cprint("==== Summary ====", "info")
+                    (new_file, tag_full, val), queued = job.result()
+                except AlreadySynced as dup:
+                    skip_synced(args, f, rel, dup.args[0], touched, stats)
+                    continue
+                except Exception as exc:
+                    cprint("warn", "Skip %s → %s", rel, exc)
+                    stats["failed"] += 1
+                    continue
+
+                pending.extend(queued)
+                synced.append((f, rel, new_file, tag_full, val))
+                if len(synced) >= args.batch_size:
+                    commit_synced(args, et, pending, synced, touched, stats)
+
+        src_root, dst_root = str(args.src_path), str(args.dst_path)
+
+        try:
+            with encoder, ThreadPoolExecutor(max_workers=args.jobs) as pool:
+                while (item := meta_q.get()) is not None:
+                    kind, f, payload = item
+                    if kind == "abort":
+                        raise payload
+                    rel = os.path.relpath(f, args.src_path)
+                    stats["processed"] += 1
+                    if kind == "fail":
+                        cprint("warn", "Skip %s → %s", rel, payload)
+                        stats["failed"] += 1
+                    elif kind == "same":
+                        skip_synced(args, f, rel, payload, touched, stats)
+                    else:
+                        meta, plan = payload
+                        job = pool.submit(sync_job, f, src_root, dst_root, opts, et, stats,
+                                          meta, plan, encoder=encoder)
+                        jobs[job] = (f, rel)
+                        if len(jobs) >= QUEUE_DEPTH:
+                            collect(wait(jobs, return_when=FIRST_COMPLETED).done)
+
+                collect(wait(jobs).done)
+
+            commit_synced(args, et, pending, synced, touched, stats)
+        finally:
+            # after an abort, nothing staged may linger in the destination
+            discard_uncommitted(pending, jobs)
+            if touched:
+                prune_dirs(args, touched, stats)
+
+    cprint("info", "==== Summary ====")
     for k, v in stats.items():
-        cprint(f"{k.replace('_', ' ').capitalize()}: {v}", "info")
+        cprint("info", "%s: %s", k.replace('_', ' ').capitalize(), v)
 
 
 # ------------------------------------------------------------------------